@@ -20,7 +20,7 @@ from splunklib.modularinput.argument import Argument
 
 from .checkpointer import CheckpointerException, FileCheckpointer, KVStoreCheckpointer
 from .event import EventException, HECEvent, XMLEvent
-from .event_writer import ClassicEventWriter, HECEventWriter
+from .event_writer import BatchingEventWriter, ClassicEventWriter, HECEventWriter
 from .modular_input import ModularInput, ModularInputException
 
 __all__ = [
@@ -29,6 +29,7 @@ __all__ = [
     "HECEvent",
     "ClassicEventWriter",
     "HECEventWriter",
+    "BatchingEventWriter",
     "CheckpointerException",
     "KVStoreCheckpointer",
     "FileCheckpointer",
@@ -15,7 +15,8 @@
 #
 
 """This module provides two kinds of event writers (ClassicEventWriter,
-HECEventWriter) to write Splunk modular input events."""
+HECEventWriter) to write Splunk modular input events, and a
+BatchingEventWriter to write them in batches."""
 
 import logging
 import multiprocessing
@@ -37,7 +38,7 @@ from ..splunkenv import get_splunkd_access_info
 from ..utils import retry
 from .event import HECEvent, XMLEvent
 
-__all__ = ["ClassicEventWriter", "HECEventWriter"]
+__all__ = ["ClassicEventWriter", "HECEventWriter", "BatchingEventWriter"]
 
 
 class EventWriter(metaclass=ABCMeta):
@@ -466,3 +467,109 @@ class HECEventWriter(EventWriter):
                     last_ex.status,
                 )
                 raise last_ex
+
+
+class BatchingEventWriter(EventWriter):
+    """Event writer which buffers events and writes them in batches.
+
+    It wraps another event writer (usually a HECEventWriter) and hands
+    buffered events to it once `batch_size` events are pending or
+    `flush_interval` seconds have passed since the last flush. The interval
+    is only checked when events are written, so `close` must be called to
+    write the remaining events.
+
+    Extra arguments of `write_events` (like `retries` and `event_field` of
+    HECEventWriter) are passed to the wrapped event writer. Events written
+    with different extra arguments are never put in the same batch, pending
+    events are flushed first.
+
+    If the wrapped event writer fails, pending events are kept and sent again
+    by the next flush.
+
+    Warning: events may still be buffered when `write_events` returns, a
+    checkpoint saved right after it may be ahead of the events actually sent.
+
+    Examples:
+        >>> from solnlib.modular_input import event_writer
+        >>> ew = event_writer.BatchingEventWriter(
+        >>>     event_writer.HECEventWriter(hec_input_name, session_key))
+        >>> ew.write_events([event1, event2])
+        >>> ew.close()
+    """
+
+    description = "BatchingEventWriter"
+
+    def __init__(
+        self,
+        event_writer: EventWriter,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        """Initializes BatchingEventWriter.
+
+        Arguments:
+            event_writer: Event writer buffered events are written with.
+            batch_size: (optional) Number of pending events which triggers
+                a flush, default is 500.
+            flush_interval: (optional) Max seconds between two flushes,
+                default is 1.0.
+        """
+        self._event_writer = event_writer
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._events = []
+        self._write_args = ((), {})
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def create_event(self, *args, **kwargs) -> Union[XMLEvent, HECEvent]:
+        """Create a new event with the wrapped event writer.
+
+        Refer to `EventWriter.create_event` for arguments.
+        """
+
+        return self._event_writer.create_event(*args, **kwargs)
+
+    def write_events(self, events: List, *args, **kwargs):
+        """Buffer events and write them once a flush threshold is hit.
+
+        Arguments:
+            events: List of events to write.
+            args: Extra arguments for `write_events` of the wrapped writer.
+            kwargs: Extra keyword arguments for `write_events` of the wrapped
+                writer.
+        """
+        if not events:
+            return
+
+        with self._lock:
+            write_args = (args, kwargs)
+            if self._events and write_args != self._write_args:
+                self._flush()
+            self._write_args = write_args
+            self._events.extend(events)
+            if (
+                len(self._events) >= self._batch_size
+                or time.monotonic() - self._last_flush >= self._flush_interval
+            ):
+                self._flush()
+
+    def flush(self):
+        """Write all buffered events."""
+
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Write all buffered events, should be called before exit."""
+
+        self.flush()
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if self._events:
+            args, kwargs = self._write_args
+            # Drop events only once they are written, so a failed write
+            # keeps them for the next flush.
+            self._event_writer.write_events(self._events, *args, **kwargs)
+            self._events = []
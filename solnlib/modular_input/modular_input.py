@@ -17,18 +17,18 @@
 """This module provides a base class of Splunk modular input."""
 
 import logging
+import re
 import sys
-import traceback
 from abc import ABCMeta, abstractmethod
 from typing import Callable, List
-from urllib import parse as urlparse
-from xml.etree import ElementTree as ET  # nosemgrep
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
 
 import defusedxml.ElementTree as defused_et
 from splunklib import binding
 from splunklib.modularinput.argument import Argument
-from splunklib.modularinput.input_definition import InputDefinition
 from splunklib.modularinput.scheme import Scheme
+from splunklib.modularinput.utils import parse_parameters
 from splunklib.modularinput.validation_definition import ValidationDefinition
 
 from .. import utils
@@ -37,6 +37,11 @@ from . import checkpointer, event_writer
 
 __all__ = ["ModularInputException", "ModularInput"]
 
+# Matches the "scheme://host:port" form splunkd passes as server_uri.
+_SPLUNKD_URI_RX = re.compile(
+    r"(?P<scheme>https?)://(?P<host>[^\s:/@?#\[\]]+):(?P<port>[0-9]+)/?"
+)
+
 
 class ModularInputException(Exception):
     """Exception for ModularInput class."""
@@ -50,8 +55,8 @@ class ModularInput(metaclass=ABCMeta):
     It's a base modular input, it should be inherited by sub modular input. For
     sub modular input, properties: 'app', 'name', 'title' and 'description' must
     be overriden, also there are some other optional properties can be overriden
-    like: 'use_external_validation', 'use_single_instance', 'use_kvstore_checkpointer'
-    and 'use_hec_event_writer'.
+    like: 'use_external_validation', 'use_single_instance', 'use_kvstore_checkpointer',
+    'use_hec_event_writer', 'hec_batch_size' and 'hec_flush_interval'.
 
     Notes: If you set 'KVStoreCheckpointer' or 'use_hec_event_writer' to True,
     you must override the corresponding 'kvstore_checkpointer_collection_name'
@@ -107,6 +112,14 @@ class ModularInput(metaclass=ABCMeta):
     # Input name of Splunk HEC, must be overridden if use_hec_event_writer
     # is True
     hec_input_name = None
+    # Number of events buffered before they are sent to Splunk HEC, default
+    # is 0 which sends events as soon as they are written
+    hec_batch_size = 0
+    # Seconds after the last flush at which buffered events are sent to
+    # Splunk HEC, only used if hec_batch_size is greater than 0. It is
+    # checked only when events are written, so events may stay buffered
+    # longer until the next write or the end of the run
+    hec_flush_interval = 1.0
 
     def __init__(self):
         # Validate properties
@@ -194,10 +207,8 @@ class ModularInput(metaclass=ABCMeta):
                     host=self.server_host,
                     port=self.server_port,
                 )
-            except binding.HTTPError as e:
-                logging.error(
-                    "Failed to init kvstore checkpointer: %s.", traceback.format_exc()
-                )
+            except binding.HTTPError:
+                logging.exception("Failed to init kvstore checkpointer.")
                 raise
         else:
             return checkpointer.FileCheckpointer(self._checkpoint_dir)
@@ -208,7 +219,10 @@ class ModularInput(metaclass=ABCMeta):
 
         The event writer returned depends on use_hec_event_writer flag,
         if use_hec_event_writer is true will return an HECEventWriter
-        object else an ClassicEventWriter object.
+        object else an ClassicEventWriter object. If hec_batch_size is also
+        greater than 0, the HECEventWriter is wrapped in a BatchingEventWriter
+        which sends events in batches, so they may not be sent yet when
+        write_events returns.
 
         Returns:
             Event writer object.
@@ -224,28 +238,41 @@ class ModularInput(metaclass=ABCMeta):
         if self.use_hec_event_writer:
             hec_input_name = ":".join([self.app, self.hec_input_name])
             try:
-                return event_writer.HECEventWriter(
+                writer = event_writer.HECEventWriter(
                     hec_input_name,
                     self.session_key,
                     scheme=self.server_scheme,
                     host=self.server_host,
                     port=self.server_port,
                 )
-            except binding.HTTPError as e:
-                logging.error(
-                    "Failed to init HECEventWriter: %s.", traceback.format_exc()
-                )
+            except binding.HTTPError:
+                logging.exception("Failed to init HECEventWriter.")
                 raise
+            if self.hec_batch_size > 0:
+                return event_writer.BatchingEventWriter(
+                    writer,
+                    batch_size=self.hec_batch_size,
+                    flush_interval=self.hec_flush_interval,
+                )
+            return writer
         else:
             return event_writer.ClassicEventWriter()
 
     def _update_metadata(self, metadata):
         self.server_host_name = metadata["server_host"]
-        splunkd = urlparse.urlsplit(metadata["server_uri"])
-        self.server_uri = splunkd.geturl()
-        self.server_scheme = splunkd.scheme
-        self.server_host = splunkd.hostname
-        self.server_port = splunkd.port
+        m = _SPLUNKD_URI_RX.fullmatch(metadata["server_uri"])
+        # Out of range ports go through urlsplit, which rejects them.
+        if m and int(m["port"]) <= 65535:
+            self.server_uri = metadata["server_uri"]
+            self.server_scheme = m["scheme"]
+            self.server_host = m["host"].lower()
+            self.server_port = int(m["port"])
+        else:
+            splunkd = urlsplit(metadata["server_uri"])
+            self.server_uri = splunkd.geturl()
+            self.server_scheme = splunkd.scheme
+            self.server_host = splunkd.hostname
+            self.server_port = splunkd.port
         self.session_key = metadata["session_key"]
         self._checkpoint_dir = metadata["checkpoint_dir"]
 
@@ -277,7 +304,7 @@ class ModularInput(metaclass=ABCMeta):
                 )
             )
 
-        return defused_et.tostring(scheme.to_xml(), encoding="unicode")
+        return defused_et.tostring(scheme.to_xml(), encoding="utf-8", method="xml")
 
     def extra_arguments(self) -> List:
         """Extra arguments for modular input.
@@ -435,10 +462,26 @@ class ModularInput(metaclass=ABCMeta):
                 }
         """
 
-        input_definition = InputDefinition.parse(sys.stdin)
+        metadata = {}
+        inputs = {}
+        root = None
+        # Stream-parse stdin and release every stanza once it is consumed,
+        # so the resident tree never holds more than one stanza's params.
+        for _, elem in defused_et.iterparse(sys.stdin, events=("end",)):
+            if elem.tag == "stanza":
+                stanza = {"__app": elem.get("app", None)}
+                for param in elem:
+                    stanza[param.get("name")] = parse_parameters(param)
+                inputs[elem.get("name")] = stanza
+                elem.clear()
+            root = elem
+
+        for node in root:
+            if node.tag != "configuration":
+                metadata[node.tag] = node.text
         return {
-            "metadata": input_definition.metadata,
-            "inputs": input_definition.inputs,
+            "metadata": metadata,
+            "inputs": inputs,
         }
 
     def execute(self):
@@ -454,6 +497,7 @@ class ModularInput(metaclass=ABCMeta):
         """
 
         if len(sys.argv) == 1:
+            run_finished = False
             try:
                 input_definition = self.get_input_definition()
                 self._update_metadata(input_definition["metadata"])
@@ -462,23 +506,33 @@ class ModularInput(metaclass=ABCMeta):
                 else:
                     self.config_name = list(input_definition["inputs"].keys())[0]
                 self.do_run(input_definition["inputs"])
+                run_finished = True
+                # Flush buffered events, events failed to send fail the run
+                if isinstance(self._event_writer, event_writer.BatchingEventWriter):
+                    self._event_writer.close()
                 logging.info("Modular input: %s exit normally.", self.name)
                 return 0
-            except Exception as e:
-                logging.error(
-                    "Modular input: %s exit with exception: %s.",
-                    self.name,
-                    traceback.format_exc(),
-                )
+            except Exception:
+                logging.exception("Modular input: %s exit with exception.", self.name)
                 return 1
             finally:
+                # Try to flush buffered events if do_run failed
+                if not run_finished and isinstance(
+                    self._event_writer, event_writer.BatchingEventWriter
+                ):
+                    try:
+                        self._event_writer.close()
+                    except Exception:
+                        logging.exception(
+                            "Modular input: %s failed to flush events.", self.name
+                        )
                 # Stop orphan monitor if any
                 if self._orphan_monitor:
                     self._orphan_monitor.stop()
 
         elif str(sys.argv[1]).lower() == "--scheme":
-            sys.stdout.write(self._do_scheme())
-            sys.stdout.flush()
+            sys.stdout.buffer.write(self._do_scheme())
+            sys.stdout.buffer.flush()
             return 0
 
         elif sys.argv[1].lower() == "--validate-arguments":
@@ -488,15 +542,15 @@ class ModularInput(metaclass=ABCMeta):
                 self.do_validation(validation_definition["parameters"])
                 return 0
             except Exception as e:
-                logging.error(
-                    "Modular input: %s validate arguments with exception: %s.",
-                    self.name,
-                    traceback.format_exc(),
+                logging.exception(
+                    "Modular input: %s validate arguments with exception.", self.name
+                )
+                sys.stderr.buffer.write(
+                    b"<error><message>"
+                    + escape(str(e)).encode("utf-8")
+                    + b"</message></error>"
                 )
-                root = ET.Element("error")
-                ET.SubElement(root, "message").text = str(e)
-                sys.stderr.write(defused_et.tostring(root))
-                sys.stderr.flush()
+                sys.stderr.buffer.flush()
                 return 1
         else:
             logging.error(
@@ -17,15 +17,23 @@
 """Net utilities."""
 import re
 import socket
+from functools import lru_cache
 
 __all__ = ["resolve_hostname", "validate_scheme_host_port"]
 
 from typing import Optional, Union
 
+_HOSTNAME_RX = re.compile(r"(?!-)(::)?[A-Z\d-]{1,63}(?<!-)$", re.IGNORECASE)
+
+_VALID_SCHEMES = frozenset(("http", "https"))
+
 
 def resolve_hostname(addr: str) -> Optional[str]:
     """Try to resolve an IP to a host name and returns None on common failures.
 
+    Successful lookups are cached, use `resolve_hostname.cache_clear()` to
+    drop them.
+
     Arguments:
         addr: IP address to resolve.
 
@@ -38,8 +46,7 @@ def resolve_hostname(addr: str) -> Optional[str]:
 
     if is_valid_ip(addr):
         try:
-            name, _, _ = socket.gethostbyaddr(addr)
-            return name
+            return _resolve_hostname(addr.strip())
         except socket.gaierror:
             # [Errno 8] nodename nor servname provided, or not known
             pass
@@ -55,6 +62,16 @@ def resolve_hostname(addr: str) -> Optional[str]:
         raise ValueError("Invalid ip address.")
 
 
+@lru_cache(maxsize=4096)
+def _resolve_hostname(addr: str) -> str:
+    # Lookup failures raise and are therefore never cached.
+    name, _ = socket.getnameinfo((addr, 0), socket.NI_NAMEREQD)
+    return name
+
+
+resolve_hostname.cache_clear = _resolve_hostname.cache_clear
+
+
 def is_valid_ip(addr: str) -> bool:
     """Validate an IPV4 address.
 
@@ -65,23 +82,12 @@ def is_valid_ip(addr: str) -> bool:
         True if is valid else False.
     """
 
-    ip_rx = re.compile(
-        r"""
-        ^(((
-              [0-1]\d{2}                  # matches 000-199
-            | 2[0-4]\d                    # matches 200-249
-            | 25[0-5]                     # matches 250-255
-            | \d{1,2}                     # matches 0-9, 00-99
-        )\.){3})                          # 3 of the preceding stanzas
-        ([0-1]\d{2}|2[0-4]\d|25[0-5]|\d{1,2})$     # final octet
-    """,
-        re.VERBOSE,
-    )
-
+    if not isinstance(addr, str):
+        return False
     try:
-        return ip_rx.match(addr.strip())
-    except AttributeError:
-        # Value was not a string
+        socket.inet_pton(socket.AF_INET, addr.strip())
+        return True
+    except (OSError, ValueError):
         return False
 
 
@@ -99,8 +105,12 @@ def is_valid_hostname(hostname: str) -> bool:
         return False
     if hostname[-1:] == ".":
         hostname = hostname[:-1]
-    allowed = re.compile(r"(?!-)(::)?[A-Z\d-]{1,63}(?<!-)$", re.IGNORECASE)
-    return all(allowed.match(x) for x in hostname.split("."))
+    if not hostname or not hostname.isascii():
+        return False
+    for label in hostname.split("."):
+        if not label or not _HOSTNAME_RX.match(label):
+            return False
+    return True
 
 
 def is_valid_port(port: Union[str, int]) -> bool:
@@ -113,6 +123,8 @@ def is_valid_port(port: Union[str, int]) -> bool:
         True if is valid else False.
     """
 
+    if isinstance(port, int):
+        return 0 < port <= 65535
     try:
         return 0 < int(port) <= 65535
     except ValueError:
@@ -129,7 +141,7 @@ def is_valid_scheme(scheme: str) -> bool:
         True if is valid else False.
     """
 
-    return scheme.lower() in ("http", "https")
+    return scheme in _VALID_SCHEMES or scheme.lower() in _VALID_SCHEMES
 
 
 def validate_scheme_host_port(scheme: str, host: str, port: Union[str, int]):
@@ -14,14 +14,18 @@
 # limitations under the License.
 #
 
+import io
 import os
 import os.path as op
 import shutil
 import sys
+from urllib.parse import urlsplit
 
 import common
+import pytest
+from splunklib.modularinput.input_definition import InputDefinition
 
-from solnlib.modular_input import Argument, checkpointer
+from solnlib.modular_input import Argument, checkpointer, event_writer
 from solnlib.modular_input.modular_input import ModularInput
 
 checkpoint_dir = op.join(op.dirname(op.abspath(__file__)), ".checkpoint_dir")
@@ -76,7 +80,8 @@ class CustomModularInput(ModularInput):
         ]
 
     def do_validation(self, parameters):
-        assert parameters["state"] == "success"
+        if parameters["state"] != "success":
+            raise ValueError(f"Invalid state <{parameters['state']}>")
 
     # Override do_run function
     def do_run(self, inputs):
@@ -121,6 +126,10 @@ def test_modular_input(monkeypatch):
         def __init__(self):
             self._buf = ""
 
+        @property
+        def buffer(self):
+            return self
+
         def read(self, size=None):
             content = self._buf
             self._buf = ""
@@ -174,6 +183,10 @@ def test_modular_input(monkeypatch):
     monkeypatch.setattr(sys, "stdin", mock_stdin)
     # with pytest.raises(AssertionError):
     md.execute()
+    assert (
+        sys.stderr.read()
+        == "<error><message>Invalid state &lt;fail&gt;</message></error>"
+    )
     mock_stdin.close()
     os.remove(".validate-arguments.xml")
 
@@ -209,7 +222,7 @@ def test_modular_input_create_checkpointer(monkeypatch):
         scheme=None,
         host=None,
         port=None,
-        **context
+        **context,
     ):
         collections[0] = collection_name
 
@@ -224,3 +237,172 @@ def test_modular_input_create_checkpointer(monkeypatch):
     checkpoint = md._create_checkpointer()
     assert collections[0] == "UnittestApp:config_test:kv_store_checkpointer_test"
     assert isinstance(checkpoint, checkpointer.KVStoreCheckpointer)
+
+
+def test_modular_input_create_event_writer(monkeypatch):
+    def mock_hec_event_writer_init(
+        self, hec_input_name, session_key, scheme=None, host=None, port=None, **context
+    ):
+        pass
+
+    monkeypatch.setattr(
+        event_writer.HECEventWriter, "__init__", mock_hec_event_writer_init
+    )
+    md = CustomModularInput()
+    md.use_hec_event_writer = True
+    md.hec_input_name = "hec_event_writer_test"
+
+    assert isinstance(md._create_event_writer(), event_writer.HECEventWriter)
+
+    md.hec_batch_size = 100
+    ew = md._create_event_writer()
+    assert isinstance(ew, event_writer.BatchingEventWriter)
+    assert ew._batch_size == 100
+    assert isinstance(ew._event_writer, event_writer.HECEventWriter)
+
+
+def test_modular_input_update_metadata():
+    md = CustomModularInput()
+    for server_uri, expected in [
+        (
+            "https://127.0.0.1:8089",
+            ("https://127.0.0.1:8089", "https", "127.0.0.1", 8089),
+        ),
+        (
+            "https://Splunk.Local:8089",
+            ("https://Splunk.Local:8089", "https", "splunk.local", 8089),
+        ),
+        (
+            "HTTPS://localhost:8089",
+            ("https://localhost:8089", "https", "localhost", 8089),
+        ),
+        ("https://[::1]:8089", ("https://[::1]:8089", "https", "::1", 8089)),
+    ]:
+        md._update_metadata(
+            {
+                "server_host": "unittest",
+                "server_uri": server_uri,
+                "session_key": common.SESSION_KEY,
+                "checkpoint_dir": checkpoint_dir,
+            }
+        )
+        assert (
+            md.server_uri,
+            md.server_scheme,
+            md.server_host,
+            md.server_port,
+        ) == expected
+
+    # Leave URIs with whitespace to urlsplit, which strips it
+    for server_uri in ["https://127.0.0.1:8089\n", "https://local\thost:8089"]:
+        md._update_metadata(
+            {
+                "server_host": "unittest",
+                "server_uri": server_uri,
+                "session_key": common.SESSION_KEY,
+                "checkpoint_dir": checkpoint_dir,
+            }
+        )
+        splunkd = urlsplit(server_uri)
+        assert (
+            md.server_uri,
+            md.server_scheme,
+            md.server_host,
+            md.server_port,
+        ) == (splunkd.geturl(), splunkd.scheme, splunkd.hostname, splunkd.port)
+
+    with pytest.raises(ValueError):
+        md._update_metadata(
+            {
+                "server_host": "unittest",
+                "server_uri": "https://127.0.0.1:99999",
+                "session_key": common.SESSION_KEY,
+                "checkpoint_dir": checkpoint_dir,
+            }
+        )
+
+
+def test_modular_input_get_input_definition(monkeypatch):
+    run_input = (
+        "<input><server_host>lli-mbpr.local</server_host>"
+        "<server_uri>https://127.0.0.1:8089</server_uri>"
+        "<session_key>{session_key}</session_key>"
+        "<checkpoint_dir>{checkpoint_dir}</checkpoint_dir>"
+        "<configuration>"
+        '<stanza name="unittest_app_collector://test1" app="unittest">'
+        '<param name="state">success</param>'
+        '<param_list name="hosts"><value>host1</value><value>host2</value>'
+        "</param_list></stanza>"
+        '<stanza name="unittest_app_collector://test2">'
+        '<param name="state">fail</param><param name="interval">60</param>'
+        "</stanza>"
+        '<stanza name="unittest_app_collector://test3" app="unittest">'
+        '<param_list name="hosts"><value>host3</value></param_list></stanza>'
+        "</configuration></input>"
+    ).format(session_key=common.SESSION_KEY, checkpoint_dir=checkpoint_dir)
+    expected = InputDefinition.parse(io.BytesIO(run_input.encode("utf-8")))
+
+    monkeypatch.setattr(sys, "stdin", io.BytesIO(run_input.encode("utf-8")))
+    input_definition = CustomModularInput().get_input_definition()
+
+    assert input_definition == {
+        "metadata": expected.metadata,
+        "inputs": expected.inputs,
+    }
+    assert len(input_definition["inputs"]) == 3
+    assert input_definition["inputs"]["unittest_app_collector://test1"] == {
+        "__app": "unittest",
+        "state": "success",
+        "hosts": ["host1", "host2"],
+    }
+
+
+def test_modular_input_flush_batching_event_writer(monkeypatch):
+    class MockEventWriter:
+        def __init__(self):
+            self.events = []
+            self.fail = False
+
+        def write_events(self, events):
+            if self.fail:
+                raise Exception("Failed to write events")
+            self.events.extend(events)
+
+    class BatchingModularInput(CustomModularInput):
+        run_fail = False
+
+        def do_run(self, inputs):
+            self.event_writer.write_events(["event1", "event2"])
+            if self.run_fail:
+                raise Exception("Failed to run")
+
+    mock_ew = MockEventWriter()
+    monkeypatch.setattr(
+        BatchingModularInput,
+        "_create_event_writer",
+        lambda self: event_writer.BatchingEventWriter(mock_ew, batch_size=100),
+    )
+    run_input = '<input><server_host>lli-mbpr.local</server_host><server_uri>https://127.0.0.1:8089</server_uri><session_key>{session_key}</session_key><checkpoint_dir>{checkpoint_dir}</checkpoint_dir><configuration><stanza name="unittest_app_collector://test1"><param name="state">success</param></stanza></configuration></input>'.format(
+        session_key=common.SESSION_KEY, checkpoint_dir=checkpoint_dir
+    )
+    sys.argv = [None]
+
+    # Buffered events are sent before the run is reported as successful
+    monkeypatch.setattr(sys, "stdin", io.BytesIO(run_input.encode("utf-8")))
+    assert BatchingModularInput().execute() == 0
+    assert mock_ew.events == ["event1", "event2"]
+
+    # Failing to send buffered events fails the run
+    mock_ew.events = []
+    mock_ew.fail = True
+    monkeypatch.setattr(sys, "stdin", io.BytesIO(run_input.encode("utf-8")))
+    assert BatchingModularInput().execute() == 1
+    assert mock_ew.events == []
+
+    # Buffered events are still sent if do_run fails
+    mock_ew.fail = False
+    md = BatchingModularInput()
+    md.run_fail = True
+    monkeypatch.setattr(sys, "stdin", io.BytesIO(run_input.encode("utf-8")))
+    assert md.execute() == 1
+    assert mock_ew.events == ["event1", "event2"]
@@ -16,11 +16,17 @@
 
 import json
 import sys
+import time
 
 import common
+import pytest
 from splunklib import binding
 
-from solnlib.modular_input import ClassicEventWriter, HECEventWriter
+from solnlib.modular_input import (
+    BatchingEventWriter,
+    ClassicEventWriter,
+    HECEventWriter,
+)
 
 
 def test_classic_event_writer(monkeypatch):
@@ -217,3 +223,94 @@ def create_hec_event_writer(i):
         return HECEventWriter.create_from_token("https://localhost:8090", "test_token")
     else:
         return HECEventWriter("HECTestInput", common.SESSION_KEY)
+
+
+def test_batching_event_writer(monkeypatch):
+    class MockEventWriter:
+        def __init__(self):
+            self.batches = []
+
+        def create_event(self, data, **kwargs):
+            return data
+
+        def write_events(self, events):
+            self.batches.append(events)
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    mock_ew = MockEventWriter()
+    ew = BatchingEventWriter(mock_ew, batch_size=3, flush_interval=5)
+    assert ew.create_event("event1", time=1372274622.493) == "event1"
+
+    # Flush once batch_size events are pending
+    ew.write_events(["event1", "event2"])
+    assert mock_ew.batches == []
+    ew.write_events(["event3"])
+    assert mock_ew.batches == [["event1", "event2", "event3"]]
+
+    # Flush once flush_interval has passed
+    ew.write_events(["event4"])
+    assert len(mock_ew.batches) == 1
+    now[0] += 5
+    ew.write_events(["event5"])
+    assert mock_ew.batches[1] == ["event4", "event5"]
+
+    # Close writes remaining events
+    ew.write_events(["event6"])
+    ew.write_events([])
+    ew.close()
+    assert mock_ew.batches[2] == ["event6"]
+    ew.close()
+    assert len(mock_ew.batches) == 3
+
+
+def test_batching_event_writer_write_args():
+    class MockEventWriter:
+        def __init__(self):
+            self.batches = []
+
+        def write_events(self, events, retries=5, event_field="event"):
+            self.batches.append((list(events), retries, event_field))
+
+    mock_ew = MockEventWriter()
+    ew = BatchingEventWriter(mock_ew, batch_size=3, flush_interval=60)
+
+    ew.write_events(["event1"], event_field="data")
+    ew.write_events(["event2"], event_field="data")
+    assert mock_ew.batches == []
+
+    # Events with other write arguments are not batched together
+    ew.write_events(["event3"])
+    assert mock_ew.batches == [(["event1", "event2"], 5, "data")]
+    ew.write_events(["event4"], 3)
+    assert mock_ew.batches[1] == (["event3"], 5, "event")
+    ew.close()
+    assert mock_ew.batches[2] == (["event4"], 3, "event")
+
+
+def test_batching_event_writer_write_failure():
+    class MockEventWriter:
+        def __init__(self):
+            self.batches = []
+            self.fail = True
+
+        def write_events(self, events):
+            if self.fail:
+                raise binding.HTTPError(
+                    common.make_response_record("", status=503), "unavailable"
+                )
+            self.batches.append(list(events))
+
+    mock_ew = MockEventWriter()
+    ew = BatchingEventWriter(mock_ew, batch_size=2, flush_interval=60)
+
+    ew.write_events(["event1"])
+    with pytest.raises(binding.HTTPError):
+        ew.write_events(["event2"])
+    assert mock_ew.batches == []
+
+    # Pending events are kept and sent by the next flush
+    mock_ew.fail = False
+    ew.close()
+    assert mock_ew.batches == [["event1", "event2"]]
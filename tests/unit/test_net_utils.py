@@ -29,10 +29,14 @@ def test_resolve_hostname(monkeypatch):
     unresolvable_ip1 = "192.168.1.1"
     unresolvable_ip2 = "192.168.1.2"
     unresolvable_ip3 = "192.168.1.3"
+    lookups = []
 
-    def mock_gethostbyaddr(addr):
+    def mock_getnameinfo(sockaddr, flags):
+        addr, _ = sockaddr
+        assert flags == socket.NI_NAMEREQD
+        lookups.append(addr)
         if addr == resolvable_ip:
-            return ("unittestServer", None, None)
+            return ("unittestServer", "0")
         elif addr == unresolvable_ip1:
             raise socket.gaierror()
         elif addr == unresolvable_ip2:
@@ -40,7 +44,8 @@ def test_resolve_hostname(monkeypatch):
         else:
             raise socket.timeout()
 
-    monkeypatch.setattr(socket, "gethostbyaddr", mock_gethostbyaddr)
+    monkeypatch.setattr(socket, "getnameinfo", mock_getnameinfo)
+    net_utils.resolve_hostname.cache_clear()
 
     with pytest.raises(ValueError):
         net_utils.resolve_hostname(invalid_ip)
@@ -49,6 +54,26 @@ def test_resolve_hostname(monkeypatch):
     assert net_utils.resolve_hostname(unresolvable_ip2) is None
     assert net_utils.resolve_hostname(unresolvable_ip3) is None
 
+    # Successful lookups are cached, failed ones are retried.
+    lookups.clear()
+    assert net_utils.resolve_hostname(resolvable_ip) == "unittestServer"
+    assert net_utils.resolve_hostname(unresolvable_ip1) is None
+    assert lookups == [unresolvable_ip1]
+    net_utils.resolve_hostname.cache_clear()
+    assert net_utils.resolve_hostname(resolvable_ip) == "unittestServer"
+    assert lookups == [unresolvable_ip1, resolvable_ip]
+
+
+def test_is_valid_ip():
+    assert net_utils.is_valid_ip("192.168.0.1") is True
+    assert net_utils.is_valid_ip(" 10.0.0.255 ") is True
+    assert net_utils.is_valid_ip("255.255.255.255") is True
+    assert net_utils.is_valid_ip("192.1.1") is False
+    assert net_utils.is_valid_ip("256.1.1.1") is False
+    assert net_utils.is_valid_ip("010.1.1.1") is False
+    assert net_utils.is_valid_ip("localhost") is False
+    assert net_utils.is_valid_ip(None) is False
+
 
 def test_is_valid_hostname():
     assert net_utils.is_valid_hostname("splunk")
@@ -58,6 +83,11 @@ def test_is_valid_hostname():
     assert not net_utils.is_valid_hostname("localhost:8000")
     assert not net_utils.is_valid_hostname("http://localhost:8000")
     assert not net_utils.is_valid_hostname("a" * 999)
+    assert net_utils.is_valid_hostname("splunk.com.")
+    assert not net_utils.is_valid_hostname("splunk..com")
+    assert not net_utils.is_valid_hostname("-splunk.com")
+    assert not net_utils.is_valid_hostname("spl\u00fcnk.com")
+    assert not net_utils.is_valid_hostname("a" * 64)
 
 
 def test_is_valid_port():